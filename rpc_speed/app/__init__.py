@@ -1,13 +1,18 @@
 import asyncio
-import json
 import logging
+from functools import partial
 from typing import Type
 
+import orjson
+from aiohttp import ClientError
+from yadisk.exceptions import YaDiskError
+
 from rpc.rpc_server import RPCServer
 from speed.accessor import SpeedReport
-from speed.execute_rpc_action import Result, execute_report, REPORT_TYPE
+from speed.execute_rpc_action import Result, get_report_dates, REPORT_TYPE
 
 from ya_disk.accessor import YaDiskAccessor
+from ya_disk.exception import ExceptionBase
 
 
 class MainApp:
@@ -23,6 +28,7 @@ class MainApp:
 
     async def start(self):
         await self.ya_disk.connect()
+        await self.speed_report.connect()
         await self.rpc_server.connect()
         await self.rpc_server.start()
         self.logger.info(f"{self.__class__.__name__} start.")
@@ -30,22 +36,26 @@ class MainApp:
 
     async def stop(self):
         await self.ya_disk.disconnect()
+        await self.speed_report.disconnect()
         await self.rpc_server.disconnect()
         self.logger.info(f"{self.__class__.__name__} stop.")
 
     async def execute_rpc_action(self, report_type: REPORT_TYPE, start_date: str = None, end_date: str = None):
         try:
             result = Result(course="")
-            file = await execute_report(self.speed_report, report_type, start_date, end_date)
-            link = await self.ya_disk.upload_and_get_public_download_link(file, file.name)
+            start, end = get_report_dates(self.speed_report, report_type, start_date, end_date)
+            link = await self.ya_disk.upload_and_get_public_download_link(
+                partial(self.speed_report.stream_report_by_date, start, end),
+                self.speed_report.report_name(start, end),
+            )
             result.result.append(link)
-        except Exception as ex:
-            return json.dumps(
+        except (ClientError, ValueError, asyncio.TimeoutError, YaDiskError, ExceptionBase) as ex:
+            return orjson.dumps(
                 Result(
                     status="ERROR",
                     course="course_type",
                     result=[],
-                    message=str(ex.args[0]),
+                    message=str(ex.args[0]) if ex.args else str(ex),
                 ).to_dict()
             )
-        return json.dumps(result.to_dict())
+        return orjson.dumps(result.to_dict())
@@ -1,7 +1,7 @@
 import logging
 import sys
 
-from core.settings import LogSettings
+from core.settings import get_log_settings
 from loguru import logger
 
 
@@ -11,7 +11,7 @@ def setup_logging() -> logging.Logger:
     In this case, there is an option to use logo ru.
     https://github.com/Delgan/loguru
     """
-    settings = LogSettings()
+    settings = get_log_settings()
     if settings.guru:
         logger.configure(
             **{
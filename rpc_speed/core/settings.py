@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Literal
 
 from pydantic import SecretStr
@@ -72,7 +73,20 @@ class RabbitMQSettings(Base):
 
 
 class RPCSettings(Base):
+    """RPC server settings.
+
+    rpc_queue_name (str): The name of the queue to consume requests from.
+    rpc_prefetch_count (int, optional): Maximum number of unacknowledged messages. Defaults to 64.
+    rpc_ack_batch_size (int, optional): Number of messages acknowledged with a single ack. Defaults to 32.
+    rpc_ack_interval (float, optional): Seconds after which pending acks are flushed. Defaults to 0.5.
+    rpc_publish_concurrency (int, optional): Maximum number of replies published at once. Defaults to 32.
+    """
+
     rpc_queue_name: str
+    rpc_prefetch_count: int = 64
+    rpc_ack_batch_size: int = 32
+    rpc_ack_interval: float = 0.5
+    rpc_publish_concurrency: int = 32
 
 
 class ServiceSettings(Base):
@@ -90,9 +104,50 @@ class YaDiskSettings(Base):
         ya_client_id (str): Yandex OAuth2 client ID.
         ya_base_dir (str, optional): Yandex Disk directory ID. Defaults to "temp_folder".
         ya_attempt_count (int, optional): Number of attempts to download a file. Defaults to 10.
+        ya_retry_count (int, optional): Number of retries of an upload after a transient error. Defaults to 3.
+        ya_base_delay (float, optional): Initial delay between upload retries in seconds. Defaults to 0.1.
+        ya_max_delay (float, optional): Maximum delay between upload retries in seconds. Defaults to 5.
+        ya_jitter (float, optional): Random fraction added to each delay. Defaults to 0.5.
+        ya_token_ttl (float, optional): Seconds a successful token check stays valid. Defaults to 300.
+        ya_chunk_size (int, optional): Size of the chunks a file is downloaded in. Defaults to 64 KiB.
+        ya_page_size (int, optional): Number of directory items requested per page. Defaults to 1000.
+        ya_concurrency (int, optional): Maximum number of simultaneous requests to Yandex Disk. Defaults to 8.
     """
 
     ya_token: str
     ya_client_id: str
     ya_base_dir: str = "ii_speed"
     ya_attempt_count: int = 10
+    ya_retry_count: int = 3
+    ya_base_delay: float = 0.1
+    ya_max_delay: float = 5.0
+    ya_jitter: float = 0.5
+    ya_token_ttl: float = 300
+    ya_chunk_size: int = 64 * 1024
+    ya_page_size: int = 1000
+    ya_concurrency: int = 8
+
+
+@lru_cache(maxsize=1)
+def get_log_settings() -> LogSettings:
+    return LogSettings()
+
+
+@lru_cache(maxsize=1)
+def get_rabbitmq_settings() -> RabbitMQSettings:
+    return RabbitMQSettings()
+
+
+@lru_cache(maxsize=1)
+def get_rpc_settings() -> RPCSettings:
+    return RPCSettings()
+
+
+@lru_cache(maxsize=1)
+def get_service_settings() -> ServiceSettings:
+    return ServiceSettings()
+
+
+@lru_cache(maxsize=1)
+def get_ya_disk_settings() -> YaDiskSettings:
+    return YaDiskSettings()
@@ -1,5 +1,12 @@
 import asyncio
 
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 from app import MainApp
 from core.logger import setup_logging
 from rpc.rpc_server import RPCServer
@@ -1,7 +1,8 @@
-import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Literal
 
+import orjson
+
 
 @dataclass
 class Response:
@@ -10,7 +11,7 @@ class Response:
     result: list = field(default_factory=list)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {"status": self.status, "message": self.message, "result": self.result}
 
     def to_bytes(self) -> bytes:
-        return json.dumps(self.to_dict()).encode("utf-8")
+        return orjson.dumps(self.to_dict())
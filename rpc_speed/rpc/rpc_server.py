@@ -1,6 +1,8 @@
-import json
+import asyncio
 import logging
+from collections import deque
 
+import orjson
 from aio_pika import Message, connect
 from aio_pika.abc import (
     AbstractChannel,
@@ -10,7 +12,7 @@ from aio_pika.abc import (
     AbstractQueue,
 )
 
-from core.settings import RabbitMQSettings, RPCSettings
+from core.settings import get_rabbitmq_settings, get_rpc_settings
 from rpc.dc import Response
 
 
@@ -23,45 +25,119 @@ class RPCServer:
     def __init__(
             self, action, logger: logging.Logger = logging.getLogger(__name__)
     ) -> None:
-        self.settings = RabbitMQSettings()
-        self.queue_name = RPCSettings().rpc_queue_name
+        self.settings = get_rabbitmq_settings()
+        self.rpc_settings = get_rpc_settings()
+        self.queue_name = self.rpc_settings.rpc_queue_name
         self.action = action
         self.logger = logger
+        self._inbox: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue()
+        self._in_flight: deque[AbstractIncomingMessage] = deque()
+        self._acked: set[int] = set()
+        self._last_message: AbstractIncomingMessage | None = None
+        self._unacked = 0
+        self._publish_sem = asyncio.Semaphore(self.rpc_settings.rpc_publish_concurrency)
+        self._pending_replies: set[asyncio.Task] = set()
 
     async def start(self) -> None:
         self.logger.info(f"{self.__class__.__name__} start.")
 
-        async with self.queue.iterator() as queue_iterator:
-            message: AbstractIncomingMessage
+        workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.rpc_settings.rpc_prefetch_count)
+        ]
+        flusher = asyncio.create_task(self._flush_acks_periodically())
+        try:
+            async with self.queue.iterator() as queue_iterator:
+                message: AbstractIncomingMessage
 
-            async for message in queue_iterator:
+                async for message in queue_iterator:
+                    self._in_flight.append(message)
+                    await self._inbox.put(message)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await asyncio.gather(*self._pending_replies, return_exceptions=True)
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            await self._flush_acks()
 
-                async with message.process(requeue=False):
-                    try:
-                        assert message.reply_to is not None, f"Bad message {message}"
-                        response = await self._execute_action(message.body)
-                    except Exception as e:
-                        self.logger.exception("Processing error")
-                        response = Response(status="ERROR", message=str(e))
-                        await self._reply_to(message, response.to_bytes())
-                        continue
-                    await self._reply_to(message, str(response).encode("utf-8"))
+    async def _worker(self) -> None:
+        """Takes messages from the inbox and processes them one by one."""
+        while True:
+            message = await self._inbox.get()
+            try:
+                await self._process(message)
+            finally:
+                self._inbox.task_done()
+
+    async def _process(self, message: AbstractIncomingMessage) -> None:
+        try:
+            assert message.reply_to is not None, f"Bad message {message}"
+            response = await self._execute_action(message.body)
+        except Exception as e:
+            self.logger.exception("Processing error")
+            response = Response(status="ERROR", message=str(e)).to_bytes()
+        task = asyncio.create_task(self._reply_and_ack(message, response))
+        self._pending_replies.add(task)
+        task.add_done_callback(self._pending_replies.discard)
+
+    async def _reply_and_ack(self, message: AbstractIncomingMessage, response: bytes) -> None:
+        """Publishes the reply in the background, so workers don't wait for the channel."""
+        try:
+            await self._reply_to(message, response)
+        except Exception:
+            self.logger.exception("Reply error")
+        finally:
+            await self._ack(message)
+
+    async def _ack(self, message: AbstractIncomingMessage) -> None:
+        """Marks the message as processed.
+
+        Messages finishing in order are acknowledged in batches with a single multiple ack,
+        a message finishing ahead of an older one is acknowledged on its own right away,
+        so a slow message never holds back the acks of the ones after it.
+        """
+        if not self._in_flight or self._in_flight[0] is not message:
+            self._acked.add(message.delivery_tag)
+            await message.ack()
+            return
+        self._last_message = self._in_flight.popleft()
+        self._unacked += 1
+        while self._in_flight and self._in_flight[0].delivery_tag in self._acked:
+            self._acked.discard(self._in_flight.popleft().delivery_tag)
+        if self._unacked >= self.rpc_settings.rpc_ack_batch_size:
+            await self._flush_acks()
+
+    async def _flush_acks(self) -> None:
+        """Acknowledges all processed messages with a single multiple ack."""
+        if not self._unacked:
+            return
+        message, self._last_message, self._unacked = self._last_message, None, 0
+        await message.ack(multiple=True)
+
+    async def _flush_acks_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.rpc_settings.rpc_ack_interval)
+            await self._flush_acks()
 
     async def _reply_to(
             self, message: AbstractIncomingMessage, response: bytes
     ) -> None:
-        await self.exchange.publish(
-            Message(
-                body=response,
-                correlation_id=message.correlation_id,
-            ),
-            routing_key=message.reply_to,
-        )
+        async with self._publish_sem:
+            await self.exchange.publish(
+                Message(
+                    body=response,
+                    correlation_id=message.correlation_id,
+                ),
+                routing_key=message.reply_to,
+            )
         self.logger.debug(f" [x] Sent {response!r}")
 
     async def connect(self):
         self.connection = await connect(self.settings.dsn(True))
-        self.channel = await self.connection.channel()
+        self.channel = await self.connection.channel(publisher_confirms=False)
+        await self.channel.set_qos(prefetch_count=self.rpc_settings.rpc_prefetch_count)
         self.exchange = self.channel.default_exchange
         self.queue = await self.channel.declare_queue(self.queue_name)
         self.logger.info(f"{self.__class__.__name__} connected.")
@@ -71,5 +147,5 @@ class RPCServer:
         self.logger.info(f"{self.__class__.__name__} disconnected.")
 
     async def _execute_action(self, params: bytes) -> bytes:
-        data = json.loads(params.decode("utf-8"))
+        data = orjson.loads(params)
         return await self.action(**data)
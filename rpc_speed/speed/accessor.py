@@ -1,9 +1,14 @@
-from datetime import datetime, timedelta
+import re
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
 from io import BytesIO
 from logging import Logger, getLogger
+from typing import AsyncIterator
+from urllib.parse import urlencode
 
-from aiohttp import ClientSession
-from core.settings import ServiceSettings
+from aiohttp import ClientResponse, ClientSession, TCPConnector
+from core.settings import ServiceSettings, get_service_settings
+from .exception import SpeedReportException
 from .utils import (
     get_first_and_last_day_of_month,
     get_first_day_of_month,
@@ -13,18 +18,94 @@ from .utils import (
 
 
 class SpeedReport:
-
-    def __init__(self, logger: Logger = getLogger(__name__), ):
+    CHUNK_SIZE = 64 * 1024
+    DATE_PATTERN = re.compile(r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])")
+    session: ClientSession | None = None
+
+    def __init__(
+            self,
+            logger: Logger = getLogger(__name__),
+            settings: ServiceSettings | None = None,
+    ):
         self.logger = logger
-        self.settings = ServiceSettings()
+        self.settings = settings or get_service_settings()
+
+    async def connect(self):
+        """Creates a shared HTTP session, reused by all report requests."""
+        self.session = ClientSession(
+            connector=TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        self.logger.info(f"{self.__class__.__name__} connected.")
+
+    async def disconnect(self):
+        """Closes the shared HTTP session."""
+        if self.session:
+            await self.session.close()
+        self.logger.info(f"{self.__class__.__name__} disconnected.")
+
+    def check_date(self, date_string: str) -> str:
+        """Checks that the date string is in the format '%Y-%m-%d'.
+
+        Args:
+            date_string (str): The date string to check.
+
+        Returns:
+            str: The same date string.
+
+        Raises:
+            ValueError: If the date string is not in the format '%Y-%m-%d'.
+        """
+        if not isinstance(date_string, str) or not self.DATE_PATTERN.fullmatch(date_string):
+            raise ValueError(f"Неверный формат даты: {date_string}")
+        return date_string
 
     def create_request_url(self, relative_url: str, **parameters) -> str:
-        return self.settings.base_url + relative_url + "?" + "&".join([f"{k}={v}" for k, v in parameters.items()])
+        return f"{self.settings.base_url}{relative_url}?{urlencode(parameters)}"
+
+    @asynccontextmanager
+    async def _open_request(self, url: str) -> AsyncIterator[ClientResponse]:
+        async with self.session.get(url) as response:
+            if not response.ok:
+                raise SpeedReportException(f"Сервис отчётов вернул ошибку {response.status}")
+            yield response
+
+    async def stream_request(self, url: str) -> AsyncIterator[bytes]:
+        async with self._open_request(url) as response:
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                yield chunk
+
+    async def make_request(self, url: str) -> BytesIO:
+        async with self._open_request(url) as response:
+            # A BytesIO created from a zero-filled bytes object of the final size
+            # is written in place, the buffer never grows or gets copied.
+            size = response.content_length
+            file = BytesIO(bytes(size)) if size else BytesIO()
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                file.write(chunk)
+        file.truncate()
+        file.seek(0)
+        return file
 
-    @staticmethod
-    async def make_request(url: str) -> bytes:
-        async with ClientSession() as session, session.get(url) as response:
-            return await response.read()
+    def create_report_url(self, start_date: str, end_date: str) -> str:
+        return self.create_request_url(
+            self.settings.analysis_report_url,
+            start_date=self.check_date(start_date),
+            end_date=self.check_date(end_date),
+        )
+
+    async def stream_report_by_date(self, start_date: str, end_date: str) -> AsyncIterator[bytes]:
+        """
+        Streams a report for a given date range chunk by chunk, without buffering the whole file.
+
+        Args:
+            start_date (str): The start date of the report.
+            end_date (str): The end date of the report.
+
+        Yields:
+            bytes: The next chunk of the report data.
+        """
+        async for chunk in self.stream_request(self.create_report_url(start_date, end_date)):
+            yield chunk
 
     async def get_report_by_date(self, start_date: str, end_date: str) -> BytesIO:
         """
@@ -37,11 +118,7 @@ class SpeedReport:
         Returns:
             BytesIO: A stream containing the report data.
         """
-        url = self.create_request_url(
-            self.settings.analysis_report_url, start_date=start_date, end_date=end_date
-        )
-        response = await self.make_request(url)
-        return BytesIO(response)
+        return await self.make_request(self.create_report_url(start_date, end_date))
 
     async def get_report(
             self, start_date: str, end_date: str, name: str = None, *_, **__
@@ -59,9 +136,64 @@ class SpeedReport:
             BytesIO: A stream containing the report data.
         """
         file = await self.get_report_by_date(start_date, end_date)
-        file.name = name if name else f"report_from {start_date}_to_{end_date}.xlsx"
+        file.name = name if name else self.report_name(start_date, end_date)
         return file
 
+    @staticmethod
+    def report_name(start_date: str, end_date: str) -> str:
+        """
+        Creates the report file name for a given date range.
+
+        Args:
+            start_date (str): The start date of the report.
+            end_date (str): The end date of the report.
+
+        Returns:
+            str: The name of the report file.
+        """
+        if start_date == end_date:
+            return f"report_from {start_date}.xlsx"
+        return f"report_from {start_date}_to_{end_date}.xlsx"
+
+    @staticmethod
+    def week_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the past seven days, including today."""
+        today = date.today()
+        return (today - timedelta(6)).isoformat(), today.isoformat()
+
+    @staticmethod
+    def month_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the past thirty days, including today."""
+        today = date.today()
+        return (today - timedelta(29)).isoformat(), today.isoformat()
+
+    @staticmethod
+    def current_day_dates() -> tuple[str, str]:
+        """Returns today as both the start and end date."""
+        today = date.today().isoformat()
+        return today, today
+
+    @staticmethod
+    def current_week_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the current week."""
+        return get_start_end_of_week(date.today().year, get_week_number())
+
+    @staticmethod
+    def current_month_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the current month."""
+        return get_first_and_last_day_of_month()
+
+    @staticmethod
+    def last_week_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the last week."""
+        return get_start_end_of_week(date.today().year, get_week_number() - 1)
+
+    @staticmethod
+    def last_month_dates() -> tuple[str, str]:
+        """Returns the start and end dates of the last month."""
+        last_day = date.today().replace(day=1) - timedelta(days=1)
+        return get_first_day_of_month(last_day), last_day.isoformat()
+
     async def get_report_week(self, *_, **__) -> BytesIO:
         """
         Asynchronous function that retrieves a report for the past week and returns it as a BytesIO object.
@@ -70,11 +202,7 @@ class SpeedReport:
         Returns:
              BytesIO: A BytesIO object containing the report.
         """
-        today = datetime.now()
-        start = (today - timedelta(6)).strftime("%Y-%m-%d")
-        end = today.strftime("%Y-%m-%d")
-
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.week_dates())
 
     async def get_report_month(self, *_, **__) -> BytesIO:
         """
@@ -84,11 +212,7 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-        today = datetime.now()
-        start = (today - timedelta(29)).strftime("%Y-%m-%d")
-        end = today.strftime("%Y-%m-%d")
-
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.month_dates())
 
     async def get_report_current_day(self, *_, **__) -> BytesIO:
         """
@@ -98,8 +222,7 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-        start = datetime.now().strftime("%Y-%m-%d")
-        return await self.get_report(start, start, f"report_from {start}.xlsx")
+        return await self.get_report(*self.current_day_dates())
 
     async def get_report_current_week(self, *_, **__) -> BytesIO:
         """
@@ -109,11 +232,7 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-        year = datetime.now().year
-        week_number = get_week_number()
-        start, end = get_start_end_of_week(year, week_number)
-
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.current_week_dates())
 
     async def get_report_current_month(self, *_, **__) -> BytesIO:
         """
@@ -123,8 +242,7 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-        start, end = get_first_and_last_day_of_month()
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.current_month_dates())
 
     async def get_report_last_week(self, *_, **__) -> BytesIO:
         """
@@ -134,11 +252,7 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-        year = datetime.now().year
-        week_number = get_week_number() - 1
-        start, end = get_start_end_of_week(year, week_number)
-
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.last_week_dates())
 
     async def get_report_last_month(self, *_, **__) -> BytesIO:
         """
@@ -148,9 +262,4 @@ class SpeedReport:
         Returns:
             BytesIO: A BytesIO object containing the report.
         """
-
-        first_day = get_first_day_of_month()
-        end = (datetime.fromisoformat(first_day) - timedelta(days=1)).isoformat()[:10]
-        start = get_first_day_of_month(end)
-
-        return await self.get_report(start, end, f"report_from {start}_to_{end}.xlsx")
+        return await self.get_report(*self.last_month_dates())
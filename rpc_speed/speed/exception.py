@@ -0,0 +1,6 @@
+from ya_disk.exception import ExceptionBase
+
+
+class SpeedReportException(ExceptionBase):
+    __slots__ = ()
+    default_args = ("Не удалось получить отчёт",)
@@ -1,11 +1,6 @@
-import json
-from dataclasses import asdict, dataclass, field
-from io import BytesIO
-from logging import Logger
-from typing import Literal
-from icecream import ic
-from core.logger import setup_logging
-from core.settings import ServiceSettings
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
 from speed.accessor import SpeedReport
 
 REPORT_TYPE = Literal[
@@ -26,40 +21,32 @@ class Result:
     message: str = "Успешно"
 
     def to_dict(self):
-        return asdict(self)
-
-
-async def execute_report(report_service: SpeedReport,
-                         report_type: REPORT_TYPE,
-                         start_date: str,
-                         end_date: str) -> BytesIO:
-    if report_type == "date_range":
-        return await report_service.get_report(start_date, end_date)
-    elif report_type == "last_week":
-        return await report_service.get_report_last_week()
-    elif report_type == "month":
-        return await report_service.get_report_month()
-    elif report_type == "last_month":
-        return await report_service.get_report_last_month()
-    elif report_type == "day":
-        return await report_service.get_report_current_day()
-    else:
-        raise Exception("Неизвестный тип отчёта")
-
+        return {
+            "status": self.status,
+            "course": self.course,
+            "result": self.result,
+            "message": self.message,
+        }
+
+
+_DATES: dict[str, Callable[..., tuple[str, str]]] = {
+    "date_range": lambda service, start_date, end_date: (
+        service.check_date(start_date), service.check_date(end_date)
+    ),
+    "week": lambda service, *_: service.week_dates(),
+    "last_week": lambda service, *_: service.last_week_dates(),
+    "month": lambda service, *_: service.month_dates(),
+    "last_month": lambda service, *_: service.last_month_dates(),
+    "day": lambda service, *_: service.current_day_dates(),
+}
+
+
+def get_report_dates(report_service: SpeedReport,
+                     report_type: REPORT_TYPE,
+                     start_date: str,
+                     end_date: str) -> tuple[str, str]:
+    dates = _DATES.get(report_type)
+    if dates is None:
+        raise ValueError("Неизвестный тип отчёта")
+    return dates(report_service, start_date, end_date)
 
-async def execute_rpc_action(report_type: REPORT_TYPE, start_date: str = None, end_date: str = None) -> str:
-    logger = setup_logging()
-    report_service = SpeedReport(logger)
-    try:
-        result = Result(course="")
-        result.result.append(await execute_report(report_service, report_type, start_date, end_date))
-    except Exception as ex:
-        return json.dumps(
-            Result(
-                status="ERROR",
-                course="course_type",
-                result=[],
-                message=str(ex.args[0]),
-            ).to_dict()
-        )
-    return json.dumps(result.to_dict())
@@ -1,10 +1,10 @@
-from datetime import datetime, timedelta
+import calendar
+from datetime import date, timedelta
 from typing import Tuple
 
 
-def get_week_number(date_string: str = datetime.now().strftime("%Y-%m-%d")) -> int:
-    date = datetime.strptime(date_string, "%Y-%m-%d")
-    return date.isocalendar()[1]
+def get_week_number(day: date | None = None) -> int:
+    return (day or date.today()).isocalendar()[1]
 
 
 def get_start_end_of_week(year: int, week_number: int):
@@ -18,66 +18,54 @@ def get_start_end_of_week(year: int, week_number: int):
     Returns:
         tuple: A tuple containing the start date and end date of the specified week in ISO format (yyyy-mm-dd).
     """
-    january_4th = datetime(year, 1, 4)
+    january_4th = date(year, 1, 4)
     january_4th_weekday = january_4th.weekday()
     first_day_of_week_1 = january_4th - timedelta(days=january_4th_weekday)
     start_of_week = first_day_of_week_1 + timedelta(weeks=week_number - 1)
     end_of_week = start_of_week + timedelta(days=6)
-    return start_of_week.isoformat()[:10], end_of_week.isoformat()[:10]
+    return start_of_week.isoformat(), end_of_week.isoformat()
 
 
-def get_first_day_of_month(
-    date_string: str = datetime.now().strftime("%Y-%m-%d"),
-) -> str:
+def get_first_day_of_month(day: date | None = None) -> str:
     """
-    Get the first day of the month for the given date string.
+    Get the first day of the month for the given date.
 
     Args:
-        date_string (str): The date string in the format '%Y-%m-%d'.
+        day (date, optional): The date. Defaults to today.
 
     Returns:
         str: The first day of the month in the format '%Y-%m-%d'.
     """
-    date = datetime.strptime(date_string, "%Y-%m-%d")
-    first_day_raw = date - timedelta(date.day - 1)
-    first_day = first_day_raw.isoformat()[:10]
-    return first_day
+    day = day or date.today()
+    return day.replace(day=1).isoformat()
 
 
-def get_last_day_of_month(
-    date_string: str = datetime.now().strftime("%Y-%m-%d"),
-) -> str:
+def get_last_day_of_month(day: date | None = None) -> str:
     """
-    Get the last day of the month for the given date string.
+    Get the last day of the month for the given date.
 
     Args:
-        date_string (str): The date string in the format '%Y-%m-%d'.
+        day (date, optional): The date. Defaults to today.
 
     Returns:
         str: The last day of the month in the format '%Y-%m-%d'.
     """
-    date = datetime.strptime(date_string, "%Y-%m-%d")
-    first_day_raw = date - timedelta(date.day - 1)
-    last_day_raw = first_day_raw - timedelta(days=1) + timedelta(weeks=4)
-    while last_day_raw.month == first_day_raw.month:
-        last_day_raw = last_day_raw + timedelta(days=1)
-    last_day_raw = last_day_raw - timedelta(days=1)
-    last_day = last_day_raw.isoformat()[:10]
-    return last_day
-
-
-def get_first_and_last_day_of_month(
-    date_string: str = datetime.now().strftime("%Y-%m-%d"),
-) -> Tuple[str, str]:
+    day = day or date.today()
+    last = calendar.monthrange(day.year, day.month)[1]
+    return f"{day.year:04d}-{day.month:02d}-{last:02d}"
+
+
+def get_first_and_last_day_of_month(day: date | None = None) -> Tuple[str, str]:
     """
-    Get the first and last day of the month for the given date string.
+    Get the first and last day of the month for the given date.
 
     Args:
-        date_string (str): The date string in the format '%Y-%m-%d'.
+        day (date, optional): The date. Defaults to today.
 
     Returns:
         Tuple[str, str]: A tuple containing the first and last day of the month in the format '%Y-%m-%d'.
     """
-    first_day = get_first_day_of_month(date_string)
-    last_day = get_last_day_of_month(date_string)
+    day = day or date.today()
+    first_day = get_first_day_of_month(day)
+    last_day = get_last_day_of_month(day)
     return first_day, last_day
@@ -0,0 +1,10 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RABBIT_USER", "guest")
+os.environ.setdefault("RABBIT_PASSWORD", "guest")
+os.environ.setdefault("RABBIT_HOST", "localhost")
+os.environ.setdefault("RABBIT_PORT", "5672")
+os.environ.setdefault("RPC_QUEUE_NAME", "speed_rpc_queue")
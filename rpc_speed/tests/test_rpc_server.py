@@ -0,0 +1,75 @@
+import asyncio
+
+import orjson
+
+from rpc.rpc_server import RPCServer
+
+
+class FakeMessage:
+    def __init__(self, delivery_tag: int, acks: list[tuple[int, bool]]) -> None:
+        self.delivery_tag = delivery_tag
+        self.acks = acks
+        self.correlation_id = str(delivery_tag)
+        self.reply_to = "reply"
+        self.body = orjson.dumps({"number": delivery_tag})
+
+    async def ack(self, multiple: bool = False) -> None:
+        self.acks.append((self.delivery_tag, multiple))
+
+
+class FakeQueue:
+    def __init__(self, messages: list[FakeMessage], stop: asyncio.Event) -> None:
+        self.messages = messages
+        self.stop = stop
+
+    def iterator(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            yield message
+        await self.stop.wait()
+
+
+class FakeExchange:
+    async def publish(self, message, routing_key):
+        return None
+
+
+def test_slow_first_message_does_not_block_acks():
+    async def run():
+        acks: list[tuple[int, bool]] = []
+        slow_release = asyncio.Event()
+        stop = asyncio.Event()
+        messages = [FakeMessage(tag, acks) for tag in range(1, 6)]
+
+        async def action(number: int) -> bytes:
+            if number == 1:
+                await slow_release.wait()
+            return orjson.dumps(number)
+
+        server = RPCServer(action)
+        server.queue = FakeQueue(messages, stop)
+        server.exchange = FakeExchange()
+        task = asyncio.create_task(server.start())
+
+        for _ in range(50):
+            await asyncio.sleep(0)
+        assert sorted(tag for tag, _ in acks) == [2, 3, 4, 5]
+        assert not any(multiple for _, multiple in acks)
+
+        slow_release.set()
+        stop.set()
+        await task
+        assert acks[-1] == (1, True)
+
+    asyncio.run(run())
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from functools import partial
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yadisk import AsyncClient
+from yadisk.sessions.aiohttp_session import AIOHTTPSession
+
+from core.settings import ServiceSettings, YaDiskSettings
+from speed.accessor import SpeedReport
+from speed.exception import SpeedReportException
+from ya_disk.accessor import YaDiskAccessor
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.checks = 0
+
+    async def check_token(self, token: str) -> bool:
+        self.checks += 1
+        return True
+
+
+def test_first_token_check_runs_soon_after_boot(monkeypatch):
+    async def run():
+        accessor = YaDiskAccessor(YaDiskSettings(ya_token="token", ya_client_id="client"))
+        accessor.client = FakeClient()
+        monkeypatch.setattr(time, "monotonic", lambda: 120.0)
+
+        await accessor._ensure_token()
+        await accessor._ensure_token()
+        assert accessor.client.checks == 1
+
+    asyncio.run(run())
+
+
+def test_failed_report_is_not_retried_as_upload_error():
+    async def run():
+        report_hits = []
+
+        async def report(request: web.Request) -> web.Response:
+            report_hits.append(request.path)
+            return web.Response(status=500)
+
+        async def put(request: web.Request) -> web.Response:
+            await request.read()
+            return web.Response(status=201)
+
+        app = web.Application()
+        app.router.add_get("/analysis/report/", report)
+        app.router.add_put("/upload", put)
+        server = TestServer(app)
+        await server.start_server()
+
+        speed_report = SpeedReport(settings=ServiceSettings(base_url=str(server.make_url("/")), tg_admin_id=1))
+        await speed_report.connect()
+        accessor = YaDiskAccessor(YaDiskSettings(ya_token="token", ya_client_id="client"))
+        accessor.client = AsyncClient(session=AIOHTTPSession())
+        accessor.client.check_token = FakeClient().check_token
+
+        async def get_upload_link(path: str, **kwargs) -> str:
+            return str(server.make_url("/upload"))
+
+        accessor.client.get_upload_link = get_upload_link
+        try:
+            with pytest.raises(SpeedReportException):
+                await accessor.upload(
+                    partial(speed_report.stream_report_by_date, "2024-01-01", "2024-01-07"), "report.xlsx"
+                )
+            assert len(report_hits) == 1
+        finally:
+            await accessor.client.close()
+            await speed_report.disconnect()
+            await server.close()
+
+    asyncio.run(run())
@@ -1,59 +1,73 @@
 import asyncio
 import logging
+import random
+import time
+from contextlib import asynccontextmanager
 from io import BytesIO
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Callable, Iterable
 
+from aiohttp import ClientError, ClientResponse, ClientTimeout, TCPConnector
 from yadisk import AsyncClient
-from yadisk.exceptions import PathNotFoundError, PathExistsError
+from yadisk.exceptions import (
+    PathExistsError,
+    PathNotFoundError,
+    RequestError,
+    RetriableYaDiskError,
+    UnauthorizedError,
+)
 from yadisk.objects import AsyncResourceObject, AsyncResourceLinkObject
+from yadisk.sessions.aiohttp_session import AIOHTTPSession
 
-from core.settings import YaDiskSettings
+from core.settings import YaDiskSettings, get_ya_disk_settings
 from .exception import YaFileNotFound, YaTokenNotValidException
 
 
 class YaDiskAccessor:
+    PATH_CACHE_SIZE = 1024
+    DOWNLOAD_TIMEOUT = ClientTimeout(sock_connect=10.0, sock_read=15.0)
     settings: YaDiskSettings
     client: AsyncClient
 
     def __init__(
             self,
-            settings: YaDiskSettings = YaDiskSettings(),
+            settings: YaDiskSettings | None = None,
             logger: logging.Logger = logging.getLogger(__name__),
     ) -> None:
-        self.settings = settings
+        self.settings = settings or get_ya_disk_settings()
         self.logger = logger
+        self._token_checked_at = float("-inf")
+        self._base_dir_prefix = f"{self.settings.ya_base_dir}/"
+        self._path_cache: dict[tuple[str, str], str] = {}
 
-    def _check_token(func):  # noqa:
-        """A decorator that verifies the Yandex disk token before executing the decorated function.
+    async def _ensure_token(self):
+        """Checks the Yandex disk token unless a check has succeeded in the last `ya_token_ttl` seconds.
 
-        Args:
-            func (function): The function to be decorated.
+        Called at the start of every operation, the fast path is a single timestamp comparison.
 
-        Returns:
-            function: The decorated function.
+        Raises:
+            YaTokenNotValidException: If the token failed verification.
         """
-
-        async def inner(self, *args, **kwargs):
-            """
-            The inner function that is executed by the decorator.
-
-            Args:
-                self (YandexDisk): The YandexDisk instance.
-                *args: Variable length argument list.
-                **kwargs: Arbitrary keyword arguments.
-
-            Returns:
-                object: The return value of the decorated function.
-            """
-            if await self.client.check_token(self.settings.ya_token):
-                return await func(self, *args, **kwargs)
+        if time.monotonic() - self._token_checked_at < self.settings.ya_token_ttl:
+            return
+        if not await self.client.check_token(self.settings.ya_token):
+            self._token_checked_at = float("-inf")
             raise YaTokenNotValidException()
+        self._token_checked_at = time.monotonic()
 
-        return inner
+    async def _recheck_token(self):
+        """Drops the cached token check after an UnauthorizedError and verifies the token again.
+
+        Raises:
+            YaTokenNotValidException: If the token failed verification.
+        """
+        self._token_checked_at = float("-inf")
+        await self._ensure_token()
 
     async def connect(self):
         """Connects to the Yandex Disk API using the provided client ID and access token.
 
+        A single aiohttp session with a keep-alive connection pool is shared by all requests.
+
         Args:
             self (YandexDisk): The YandexDisk instance.
 
@@ -62,9 +76,12 @@ class YaDiskAccessor:
         """
         self.client = AsyncClient(
             id=self.settings.ya_client_id,
-            session="aiohttp",
+            session=AIOHTTPSession(
+                connector=TCPConnector(limit=self.settings.ya_concurrency, ttl_dns_cache=600)
+            ),
             token=self.settings.ya_token
         )
+        self._token_checked_at = float("-inf")
         await self.__setup()
         self.logger.info(f"{self.__class__.__name__} connected.")
 
@@ -80,7 +97,6 @@ class YaDiskAccessor:
         await self.client.close()
         self.logger.info(f"{self.__class__.__name__} disconnected.")
 
-    @_check_token  # noqa:
     async def __setup(self):
         """Sets up the Yandex Disk client by verifying the access token and creating the directors if it does not exist.
 
@@ -90,12 +106,30 @@ class YaDiskAccessor:
         Returns:
             None: Returns nothing.
         """
-        if not await self.client.is_dir(self.settings.ya_base_dir):
+        await self._ensure_token()
+        try:
+            is_dir = await self.client.is_dir(self.settings.ya_base_dir)
+        except UnauthorizedError:
+            await self._recheck_token()
+            is_dir = await self.client.is_dir(self.settings.ya_base_dir)
+        if not is_dir:
             await self.client.mkdir(self.settings.ya_base_dir)
 
-    @_check_token  # noqa:
     async def list_dir(self) -> AsyncGenerator["AsyncResourceObject", None]:
-        return await self.client.listdir(self.settings.ya_base_dir)
+        """Iterates over the base directory, items are yielded as their pages arrive.
+
+        Yields:
+            AsyncResourceObject: The next item of the directory.
+        """
+        await self._ensure_token()
+        try:
+            async for item in await self.client.listdir(
+                    self.settings.ya_base_dir, limit=self.settings.ya_page_size
+            ):
+                yield item
+        except UnauthorizedError:
+            self._token_checked_at = float("-inf")
+            raise
 
     def make_file_path(self, upload_file_name: str, number: str = "") -> str:
         """Creates a unique path for the uploaded or otherwise file on Yandex Disk.
@@ -107,12 +141,87 @@ class YaDiskAccessor:
         Returns:
             str: The unique path for file on Yandex Disk.
         """
-        name, *suf = upload_file_name.split(".")
-        name += f"({number})" if number else ""
-        name += f".{'.'.join(suf)}" if suf else ""
-        return "/".join([self.settings.ya_base_dir, name])
+        if not number:
+            return f"{self._base_dir_prefix}{upload_file_name}"
+        key = (upload_file_name, number)
+        if (path := self._path_cache.get(key)) is not None:
+            return path
+        base, dot, ext = upload_file_name.rpartition(".")
+        if dot:
+            path = f"{self._base_dir_prefix}{base}({number}).{ext}"
+        else:
+            path = f"{self._base_dir_prefix}{upload_file_name}({number})"
+        if len(self._path_cache) >= self.PATH_CACHE_SIZE:
+            del self._path_cache[next(iter(self._path_cache))]
+        self._path_cache[key] = path
+        return path
+
+    async def get_download_link(self, filename: str) -> str:
+        """
+        Gets a direct download link of a file on Yandex Disk.
+
+        Args:
+            filename (str): The name of the file.
+
+        Returns:
+            str: The download link.
+
+        Raises:
+            YaFileNotFound: If the file does not exist on Yandex Disk.
+        """
+        await self._ensure_token()
+        path_to_file = self.make_file_path(filename)
+        try:
+            try:
+                return await self.client.get_download_link(path_to_file)
+            except UnauthorizedError:
+                await self._recheck_token()
+                return await self.client.get_download_link(path_to_file)
+        except PathNotFoundError:
+            raise YaFileNotFound(f"File not : {filename}")
+
+    @asynccontextmanager
+    async def _open_download(self, filename: str) -> AsyncIterator[ClientResponse]:
+        """Opens the download response, retrying connection errors, timeouts and 5xx responses.
+
+        The download host is picked at random, so its connection is not kept alive in the pool.
+        """
+        link = await self.get_download_link(filename)
+        session = self.client.session.aiohttp_session
+        for attempt in range(self.settings.ya_retry_count + 1):
+            try:
+                response = await session.get(
+                    link, timeout=self.DOWNLOAD_TIMEOUT, headers={"Connection": "close"}
+                )
+            except (ClientError, asyncio.TimeoutError):
+                if attempt == self.settings.ya_retry_count:
+                    raise
+            else:
+                if response.status < 500 or attempt == self.settings.ya_retry_count:
+                    break
+                response.release()
+            await asyncio.sleep(self.backoff_delay(attempt))
+        async with response:
+            response.raise_for_status()
+            yield response
+
+    async def download_stream(self, filename: str) -> AsyncIterator[bytes]:
+        """
+        Downloads a file from Yandex Disk chunk by chunk, without buffering the whole file.
+
+        Args:
+            filename (str): The name of the file to be downloaded.
+
+        Yields:
+            bytes: The next chunk of the file.
+
+        Raises:
+            YaFileNotFound: If the file does not exist on Yandex Disk.
+        """
+        async with self._open_download(filename) as response:
+            async for chunk in response.content.iter_chunked(self.settings.ya_chunk_size):
+                yield chunk
 
-    @_check_token  # noqa:
     async def download(self, filename: str) -> BytesIO:
         """
         Downloads a file from Yandex Disk.
@@ -126,17 +235,18 @@ class YaDiskAccessor:
         Raises:
             YaFileNotFound: If the file does not exist on Yandex Disk.
         """
-        file = BytesIO()
-        file.name = filename
-        try:
-            path_to_file = self.make_file_path(filename)
-            await self.client.download(path_to_file, file)
-        except PathNotFoundError:
-            raise YaFileNotFound(f"File not : {filename}")
+        async with self._open_download(filename) as response:
+            # A BytesIO created from a zero-filled bytes object of the final size
+            # is written in place, the buffer never grows or gets copied.
+            size = response.content_length
+            file = BytesIO(bytes(size)) if size else BytesIO()
+            async for chunk in response.content.iter_chunked(self.settings.ya_chunk_size):
+                file.write(chunk)
+        file.truncate()
         file.seek(0)
+        file.name = filename
         return file
 
-    @_check_token  # noqa:
     async def remove(self, file_name: str):
         """
         Removes a file from Yandex Disk.
@@ -147,20 +257,65 @@ class YaDiskAccessor:
         Raises:
             YaFileNotFound: If the file does not exist on Yandex Disk.
         """
+        await self._ensure_token()
         path_to_file = self.make_file_path(file_name)
         try:
-            return await self.client.remove(path_to_file)
+            try:
+                return await self.client.remove(path_to_file)
+            except UnauthorizedError:
+                await self._recheck_token()
+                return await self.client.remove(path_to_file)
         except PathNotFoundError:
             raise YaFileNotFound(f"File not : {path_to_file}")
 
-    @_check_token  # noqa:
+    def backoff_delay(self, attempt: int) -> float:
+        """Calculates the exponential delay with jitter before the next attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting from 0.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = self.settings.ya_base_delay * (2 ** attempt) * (1 + random.random() * self.settings.ya_jitter)
+        return min(self.settings.ya_max_delay, delay)
+
+    @staticmethod
+    def _track_source_errors(
+            source: Callable[[], AsyncGenerator[bytes, None]], errors: list[Exception]
+    ) -> Callable[[], AsyncGenerator[bytes, None]]:
+        """Wraps a streamed upload source so that its own errors are recorded.
+
+        yadisk reports any error raised while sending the request body as a connection error,
+        the recorded exception lets the caller tell a failed source from a failed upload.
+
+        Args:
+            source (Callable[[], AsyncGenerator[bytes, None]]): An async generator function yielding the file chunks.
+            errors (list[Exception]): The list the source errors are appended to.
+
+        Returns:
+            Callable[[], AsyncGenerator[bytes, None]]: An async generator function yielding the same chunks.
+        """
+
+        async def tracked() -> AsyncGenerator[bytes, None]:
+            try:
+                async for chunk in source():
+                    yield chunk
+            except Exception as ex:
+                errors.append(ex)
+                raise
+
+        return tracked
+
     async def upload(
-            self, file: BytesIO | bytes, file_name: str
+            self, file: BytesIO | bytes | Callable[[], AsyncGenerator[bytes, None]], file_name: str
     ) -> AsyncResourceLinkObject:
         """Uploads a file to Yandex Disk.
 
         Args:
-            file (BytesIO | bytes): The file to be uploaded.
+            file (BytesIO | bytes | Callable[[], AsyncGenerator[bytes, None]]): The file to be uploaded,
+                or an async generator function (optionally wrapped in functools.partial) yielding its chunks
+                to stream it without buffering.
             file_name (str): The name of the file.
 
         Returns:
@@ -169,31 +324,95 @@ class YaDiskAccessor:
         Raises:
             ValueError: If the file could not be uploaded after a certain number of attempts.
             ResourceIsLockedError: If the file is locked on Yandex Disk.
+            Exception: Any error raised by a streamed file source, the upload is not retried then.
         """
+        await self._ensure_token()
+        source_errors: list[Exception] = []
+        if isinstance(file, bytes):
+            file = BytesIO(file)
+        elif callable(file):
+            file = self._track_source_errors(file, source_errors)
         number = 0
+        attempt = 0
+        rechecked = False
         while number < self.settings.ya_attempt_count:
             upload_file = self.make_file_path(
                 f"{file_name}", str(number) if number else ""
             )
+            if isinstance(file, BytesIO):
+                file.seek(0)
             try:
-                return await self.client.upload(file, upload_file)
+                return await self.client.upload(file, upload_file, n_retries=0)
             except PathExistsError:
                 self.logger.warning(f"File {upload_file} already exists")
-            number += 1
-            await asyncio.sleep(1)
+                number += 1
+            except UnauthorizedError:
+                if rechecked:
+                    raise
+                rechecked = True
+                await self._recheck_token()
+            except (RequestError, RetriableYaDiskError):
+                if source_errors:
+                    raise source_errors[-1]
+                if attempt >= self.settings.ya_retry_count:
+                    raise
+                await asyncio.sleep(self.backoff_delay(attempt))
+                attempt += 1
 
         raise ValueError(f"Please rename upload file")
 
-    async def upload_and_get_public_download_link(self, file: BytesIO | bytes, file_name: str) -> str:
+    async def upload_and_get_public_download_link(
+            self, file: BytesIO | bytes | Callable[[], AsyncGenerator[bytes, None]], file_name: str
+    ) -> str:
         """Uploads a file to Yandex Disk and returns its public download link.
 
         Args:
-            file (BytesIO | bytes): The file to be uploaded.
+            file (BytesIO | bytes | Callable[[], AsyncGenerator[bytes, None]]): The file to be uploaded,
+                or an async generator function (optionally wrapped in functools.partial) yielding its chunks
+                to stream it without buffering.
             file_name (str): The name of the file.
 
         Returns:
             str: The public download link of the uploaded file.
         """
         ya_object = await self.upload(file, file_name)
-        await ya_object.publish()
-        return await ya_object.get_download_link()
+        _, link = await asyncio.gather(ya_object.publish(), ya_object.get_download_link())
+        return link
+
+    async def upload_many(
+            self, files: Iterable[tuple[BytesIO | bytes, str]], concurrency: int | None = None
+    ) -> list[AsyncResourceLinkObject]:
+        """Uploads several files to Yandex Disk concurrently.
+
+        Args:
+            files (Iterable[tuple[BytesIO | bytes, str]]): Pairs of the file and its name.
+            concurrency (int, optional): Maximum number of simultaneous uploads. Defaults to `ya_concurrency`.
+
+        Returns:
+            list[AsyncResourceLinkObject]: The uploaded resources, in the order of `files`.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.settings.ya_concurrency)
+
+        async def upload_one(file: BytesIO | bytes, file_name: str) -> AsyncResourceLinkObject:
+            async with semaphore:
+                return await self.upload(file, file_name)
+
+        return await asyncio.gather(*[upload_one(file, file_name) for file, file_name in files])
+
+    async def download_many(self, filenames: Iterable[str], concurrency: int | None = None) -> list[BytesIO]:
+        """Downloads several files from Yandex Disk concurrently.
+
+        Args:
+            filenames (Iterable[str]): The names of the files to be downloaded.
+            concurrency (int, optional): Maximum number of simultaneous downloads. Defaults to `ya_concurrency`.
+
+        Returns:
+            list[BytesIO]: The downloaded files, in the order of `filenames`.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.settings.ya_concurrency)
+
+        async def download_one(filename: str) -> BytesIO:
+            async with semaphore:
+                return await self.download(filename)
+
+        return await asyncio.gather(*[download_one(filename) for filename in filenames])
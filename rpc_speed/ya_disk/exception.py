@@ -9,8 +9,12 @@ class ExceptionBase(Exception):
     Attributes:
         args (str): The error message.
         exception (Exception): The original exception that caused this exception to be raised.
+        default_args (tuple): The error message used when none is given.
     """
 
+    __slots__ = ("exception",)
+    default_args: tuple = ()
+
     def __init__(self, *args, exception: Exception = None):
         """
         Initialize the ExceptionBase instance.
@@ -19,10 +23,8 @@ class ExceptionBase(Exception):
             args (str): The error message.
             exception (Exception): The original exception that caused this exception to be raised.
         """
-        if args:
-            self.args = args
-        if exception:
-            self.exception = exception
+        super().__init__(*(args or self.default_args))
+        self.exception = exception
 
     def __str__(self):
         """
@@ -31,16 +33,20 @@ class ExceptionBase(Exception):
         Returns:
             str: The error message.
         """
-        return f"{self.args[0]}"
+        message = self.args[0]
+        return message if type(message) is str else str(message)
 
 
 class YandexDiskException(ExceptionBase):
-    args = ("Unknown error",)
+    __slots__ = ()
+    default_args = ("Unknown error",)
 
 
 class YaTokenNotValidException(YandexDiskException):
-    args = ("The Yandex disk token failed verification, update token.",)
+    __slots__ = ()
+    default_args = ("The Yandex disk token failed verification, update token.",)
 
 
 class YaFileNotFound(ExceptionBase):
-    args = ("File not found",)
+    __slots__ = ()
+    default_args = ("File not found",)